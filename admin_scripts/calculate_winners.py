@@ -14,7 +14,7 @@ from __future__ import annotations
 
 import csv
 from collections import defaultdict
-from datetime import UTC, datetime
+from datetime import datetime
 from pathlib import Path
 
 # Start time
@@ -33,33 +33,34 @@ CSV_FILE_PATH = r"C:\Users\username\Downloads\hunt.huntevent.csv"
 type TeamName = str
 
 
-def parse_timestamp(timestamp: str) -> datetime:
-    return datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").replace(tzinfo=UTC)
-
-
 def main(csv_file: str) -> None:
-    teams = TEAM_NAMES
+    teams = set(TEAM_NAMES)
     team_raw_times: dict[TeamName, float] = defaultdict(float)
     team_running_totals: dict[TeamName, float] = defaultdict(float)
     team_hints_requested: dict[TeamName, int] = defaultdict(int)
     team_levels: dict[TeamName, int] = defaultdict(int)
 
-    with Path(csv_file).open(encoding="utf-8") as f:
-        csv_reader = csv.DictReader(f)
+    with Path(csv_file).open(encoding="utf-8", buffering=1 << 20) as f:
+        csv_reader = csv.reader(f)
+        header = next(csv_reader)
+        user_column = header.index("user")
+        kind_column = header.index("kind")
+        level_column = header.index("level")
+        time_column = header.index("time")
 
         for line in csv_reader:
-            team = line["user"]
+            team = line[user_column]
             assert team in teams
             # penalty of x hours per hint
-            if line["type"] == "REQ":
+            kind = line[kind_column]
+            if kind == "REQ":
                 team_running_totals[team] += PENALTY_PER_HINT_IN_HOURS
                 team_hints_requested[team] += 1
-            elif line["type"] == "ADV":
+            elif kind == "ADV":
                 team_levels[team] += 1
                 # Final level
-                if line["level"] == FINAL_LEVEL:
-                    timestamp = line["time"].split(".")[0]
-                    finish_time = parse_timestamp(timestamp)
+                if line[level_column] == FINAL_LEVEL:
+                    finish_time = datetime.fromisoformat(line[time_column])
                     time_taken = (finish_time - START_TIME).total_seconds() / 60 / 60
                     print(time_taken)
                     team_running_totals[team] += time_taken
@@ -13,6 +13,9 @@ SERVER = "http://localhost:8000"
 USERNAME = "admin"
 PASSWORD = "adminpasswordhere"  # noqa: S105
 
+CHUNK_SIZE = 64 * 1024
+MAX_CONCURRENT_DOWNLOADS = 16
+
 
 class Hint(BaseModel):
     number: int
@@ -36,11 +39,12 @@ class Page(BaseModel):
 
 async def download_hint(
     session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
     path: Path,
     level: Level,
     hint: Hint,
 ) -> None:
-    async with session.get(hint.image.unicode_string()) as r:
+    async with semaphore, session.get(hint.image.unicode_string()) as r:
         if not r.ok:
             print(f"Error downloading level {level.number} image {hint.number}")
             print(await r.text())
@@ -52,8 +56,8 @@ async def download_hint(
         image_file = path / f"image{hint.number}{suffix}"
 
         with image_file.open("wb") as f:
-            async for chunk, _end in r.content.iter_chunks():
-                f.write(chunk)
+            async for chunk in r.content.iter_chunked(CHUNK_SIZE):
+                await asyncio.to_thread(f.write, chunk)
 
 
 def save_level(path: Path, level: Level) -> None:
@@ -76,7 +80,13 @@ def save_level(path: Path, level: Level) -> None:
 
 
 async def main(path: Path) -> None:
-    async with aiohttp.ClientSession() as session:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    connector = aiohttp.TCPConnector(
+        limit=2 * MAX_CONCURRENT_DOWNLOADS,
+        limit_per_host=MAX_CONCURRENT_DOWNLOADS,
+        keepalive_timeout=30,
+    )
+    async with aiohttp.ClientSession(connector=connector) as session:
         next_page: HttpUrl | None = TypeAdapter(HttpUrl).validate_strings(
             f"{SERVER}/api/levels"
         )
@@ -99,7 +109,9 @@ async def main(path: Path) -> None:
                 level_dir = path / f"level-{level.number:02d}"
                 save_level(level_dir, level)
                 for hint in level.hints:
-                    hint_download = download_hint(session, level_dir, level, hint)
+                    hint_download = download_hint(
+                        session, semaphore, level_dir, level, hint
+                    )
                     hint_downloads.append(hint_download)
 
             await asyncio.gather(*hint_downloads)
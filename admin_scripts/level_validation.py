@@ -25,8 +25,10 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import TextIO
 
@@ -36,8 +38,12 @@ CONTENT_TYPES = {
     ".png": "image/png",
 }
 
+NOT_NUMBER_OR_DP = re.compile(r"[^0-9.]")
+
 
 def unzip_all() -> None:
+    zip_paths: list[Path] = []
+    folder_paths: list[Path] = []
     for file_ in Path(ALL_LEVELS_DIR).iterdir():
         if file_.suffix != ".zip":
             continue
@@ -46,119 +52,141 @@ def unzip_all() -> None:
         if folder_path.exists():
             continue
 
-        with zipfile.ZipFile(file_) as zip_ref:
-            zip_ref.extractall(folder_path)
+        zip_paths.append(file_)
+        folder_paths.append(folder_path)
 
+    # Decompression is CPU-bound, so extract the archives in parallel.
+    with ProcessPoolExecutor() as executor:
+        for _ in executor.map(unzip, zip_paths, folder_paths):
+            pass
 
-def validate_format() -> None:
-    count = 0
-    for dir_path in Path(ALL_LEVELS_DIR).iterdir():
-        if not dir_path.is_dir():
-            continue
 
-        if "DUMMY" in dir_path.name:
-            continue
+def unzip(zip_path: Path, folder_path: Path) -> None:
+    with zipfile.ZipFile(zip_path) as zip_ref:
+        zip_ref.extractall(folder_path)
 
-        count += 1
-        if (dir_path / "about.json").exists():
-            # Check json for values
-            with (dir_path / "about.json").open() as f:
-                check_json(f, dir_path.name)
-        else:
-            print("No json in", dir_path)
-
-        readme_path: Path | None = None
-        for possible_readme_filename in (
-            "readme.md",
-            "README.md",
-            "README.txt",
-            "readme.txt",
-        ):
-            possible_readme_path = dir_path / possible_readme_filename
-            if possible_readme_path.exists():
-                readme_path = possible_readme_path
-                # Assume only one readme exists
-                break
-
-        if readme_path is None:
-            print("No readme in", dir_path)
-
-        if not (dir_path / "blurb.txt").exists():
-            print("No blurb in", dir_path)
-
-        # Check readme is bigger than blurb
-        if (dir_path / "blurb.txt").exists() and readme_path is not None:
-            blurb_size = (dir_path / "blurb.txt").stat().st_size
-            readme_size = readme_path.stat().st_size
-            if blurb_size > readme_size:
-                print("Blurb is bigger than readme for", dir_path)
-
-        images = [
-            file_
-            for file_ in dir_path.iterdir()
-            if file_.suffix.lower() in CONTENT_TYPES
-        ]
-
-        # Should find exactly the right number - check the file extensions if not.
-        if len(images) != 5:
-            print(f"Found {len(images)} images in {dir_path}")
-        else:
-            images.sort(key=lambda x: x.name.lower())
-            if not images[0].name.startswith("clue"):
-                print("No clue in", dir_path)
-
-            # Check the images aren't too big or bad things will happen to the
-            # upload. We don't want a repeat of the Wawrinka incident.
-            for i, image in enumerate(images):
-                image_size = image.stat().st_size
-                if image_size > 3 * 1000 * 1000:  # ~3 MB
-                    print(
-                        "Image",
-                        image,
-                        "is too big in",
-                        dir_path,
-                        "size = ",
-                        f"{image_size:,}",
-                    )
-
-                if not image.name.startswith("hint"):
-                    print("No hint", i, "in", dir_path)
-
-    print("Analyzed", count, "levels")
-
-
-def check_coord(coord: str, coord_name: str, filename: str) -> None:
+
+def validate_format() -> None:
+    dir_paths = [
+        dir_path
+        for dir_path in Path(ALL_LEVELS_DIR).iterdir()
+        if dir_path.is_dir() and "DUMMY" not in dir_path.name
+    ]
+
+    # The checks are dominated by filesystem latency, so run them on a pool of
+    # threads.  Problems are collected per level and reported in order.
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for problems in executor.map(validate_level, dir_paths):
+            for problem in problems:
+                print(problem)
+
+    print("Analyzed", len(dir_paths), "levels")
+
+
+def validate_level(dir_path: Path) -> list[str]:
+    problems: list[str] = []
+
+    # Scan the directory just once: entries cache their own stat results.  Key them by
+    # lower-cased name, so that file names match regardless of case as they do on
+    # Windows.
+    with os.scandir(dir_path) as it:
+        entries = {entry.name.lower(): entry for entry in it}
+
+    about = entries.get("about.json")
+    if about is not None:
+        # Check json for values
+        with Path(about.path).open() as f:
+            problems.extend(check_json(f, dir_path.name))
+    else:
+        problems.append(f"No json in {dir_path}")
+
+    # Assume only one readme exists
+    readme = entries.get("readme.md") or entries.get("readme.txt")
+    if readme is None:
+        problems.append(f"No readme in {dir_path}")
+
+    blurb = entries.get("blurb.txt")
+    if blurb is None:
+        problems.append(f"No blurb in {dir_path}")
+
+    # Check readme is bigger than blurb
+    if blurb is not None and readme is not None:
+        blurb_size = blurb.stat().st_size
+        readme_size = readme.stat().st_size
+        if blurb_size > readme_size:
+            problems.append(f"Blurb is bigger than readme for {dir_path}")
+
+    images = [
+        entry
+        for entry in entries.values()
+        if Path(entry.name).suffix.lower() in CONTENT_TYPES
+    ]
+
+    # Should find exactly the right number - check the file extensions if not.
+    if len(images) != 5:
+        problems.append(f"Found {len(images)} images in {dir_path}")
+    else:
+        images.sort(key=lambda x: x.name.lower())
+        if not images[0].name.startswith("clue"):
+            problems.append(f"No clue in {dir_path}")
+
+        # Check the images aren't too big or bad things will happen to the
+        # upload. We don't want a repeat of the Wawrinka incident.
+        for i, image in enumerate(images):
+            image_size = image.stat().st_size
+            if image_size > 3 * 1000 * 1000:  # ~3 MB
+                problems.append(
+                    f"Image {image.path} is too big in {dir_path} size = {image_size:,}"
+                )
+
+            if not image.name.startswith("hint"):
+                problems.append(f"No hint {i} in {dir_path}")
+
+    return problems
+
+
+def check_coord(coord: str, coord_name: str, filename: str) -> list[str]:
+    problems: list[str] = []
     lat = float(coord)
     if not lat:
-        print("No", coord_name, "for level", filename)
+        problems.append(f"No {coord_name} for level {filename}")
     elif lat == 0.0:
-        print("  warning: 0", coord_name, "for level", filename)
+        problems.append(f"  warning: 0 {coord_name} for level {filename}")
 
-    numbers_and_dp_only = re.sub(r"[^0-9.]", "", coord)
-    a, b = numbers_and_dp_only.split(".") if "." in coord else (coord, "")
+    numbers_and_dp_only = NOT_NUMBER_OR_DP.sub("", coord)
+    a, _, b = numbers_and_dp_only.partition(".")
     if len(b) > 5:
-        print("More than 5 dp for", coord_name, "for level", filename, ":", coord)
+        problems.append(
+            f"More than 5 dp for {coord_name} for level {filename} : {coord}"
+        )
     if len(a) + len(b) > 7:
-        print("More than 7 digits for", coord_name, "for level", filename, ":", coord)
+        problems.append(
+            f"More than 7 digits for {coord_name} for level {filename} : {coord}"
+        )
 
+    return problems
 
-def check_json(f: TextIO, filename: str) -> None:
+
+def check_json(f: TextIO, filename: str) -> list[str]:
+    problems: list[str] = []
     json_data = json.load(f)
     if not len(json_data["name"]) > 0:
-        print("No name for level", filename)
+        problems.append(f"No name for level {filename}")
 
-    check_coord(json_data["latitude"], "lat", filename)
-    check_coord(json_data["longitude"], "long", filename)
+    problems.extend(check_coord(json_data["latitude"], "lat", filename))
+    problems.extend(check_coord(json_data["longitude"], "long", filename))
 
     tol = int(json_data["tolerance"])
     if not tol:
-        print("No tolerance for level", filename)
+        problems.append(f"No tolerance for level {filename}")
     elif tol < 1:
-        print("0 tolerance for level", filename)
+        problems.append(f"0 tolerance for level {filename}")
     elif tol < 20:
-        print("Too-low-resolution tolerance of", tol, "for level", filename)
+        problems.append(f"Too-low-resolution tolerance of {tol} for level {filename}")
     elif tol <= 50:
-        print("  warning: Small tolerance of", tol, "for level", filename)
+        problems.append(f"  warning: Small tolerance of {tol} for level {filename}")
+
+    return problems
 
 
 if __name__ == "__main__":
@@ -81,28 +81,30 @@ class Uploader:
             msg = f"unrecognized suffix: {suffix}"
             raise RuntimeError(msg)
 
-        with image.open("rb") as f:
-            url = f"{SERVER}/api/levels/{level.number}/hint"
-            auth = aiohttp.BasicAuth(USERNAME, PASSWORD)
-            data = aiohttp.FormData()
-            data.add_field(
-                "file",
-                f,
-                filename=image.name,
-                content_type=content_type,
-            )
-            payload = {"number": hint}
-            data.add_field(
-                "data",
-                json.dumps(payload),
-                content_type="application/json",
-            )
-            async with self.session.post(url, auth=auth, data=data) as r:
-                if not r.ok:
-                    print(f"Error uploading level {level.number} hint {hint}")
-                    print(await r.text())
-
-                r.raise_for_status()
+        # Read the image in a worker thread, to keep disk I/O off the event loop.
+        content = await asyncio.to_thread(image.read_bytes)
+
+        url = f"{SERVER}/api/levels/{level.number}/hint"
+        auth = aiohttp.BasicAuth(USERNAME, PASSWORD)
+        data = aiohttp.FormData()
+        data.add_field(
+            "file",
+            content,
+            filename=image.name,
+            content_type=content_type,
+        )
+        payload = {"number": hint}
+        data.add_field(
+            "data",
+            json.dumps(payload),
+            content_type="application/json",
+        )
+        async with self.session.post(url, auth=auth, data=data) as r:
+            if not r.ok:
+                print(f"Error uploading level {level.number} hint {hint}")
+                print(await r.text())
+
+            r.raise_for_status()
 
     async def upload_level(self, level: Level) -> None:
         """
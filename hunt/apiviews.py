@@ -104,13 +104,17 @@ class LevelViewSet(AllowPUTAsCreateMixin[Level], viewsets.ModelViewSet[Level]):
         try:
             hint = level.hints.get(number=number)
             if hint.image:
-                hint.image.delete()
+                hint.image.delete(save=False)
         except Hint.DoesNotExist:
             hint = Hint(level=level, number=number)
             created = True
 
         filename = f"{uuid4()}{extension}"
-        hint.image.save(filename, upload.file)
+        hint.image.save(filename, upload.file, save=False)
+        if created:
+            hint.save()
+        else:
+            hint.save(update_fields=["image"])
 
         serializer = HintSerializer(hint, context={"request": request})
         status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
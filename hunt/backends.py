@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, override
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.exceptions import PermissionDenied
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+
+# Almost every page reads the team's progress, so load it along with the user.
+class HuntInfoBackend(ModelBackend):
+    # ModelBackend stays listed so that existing sessions still load, but a failed
+    # login here should not go on to hash the password a second time there.
+    @override
+    def authenticate(
+        self,
+        request: HttpRequest | None,
+        username: str | None = None,
+        password: str | None = None,
+        **kwargs: Any,
+    ) -> User | None:
+        user = super().authenticate(request, username, password, **kwargs)
+        if user is None:
+            raise PermissionDenied
+        return user
+
+    @override
+    def get_user(self, user_id: Any) -> User | None:
+        try:
+            user = User.objects.select_related("huntinfo").get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+
+        return user if self.user_can_authenticate(user) else None
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, TypedDict
 
+import orjson
 from asgiref.sync import sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 
@@ -15,6 +16,9 @@ if TYPE_CHECKING:
         username: str
         message: str
 
+    class ChatEvent(TypedDict):
+        text: str
+
 
 class ChatConsumer(AsyncJsonWebsocketConsumer):  # type: ignore[misc]
     def __init__(self) -> None:
@@ -48,6 +52,21 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):  # type: ignore[misc]
         if self.room_group is not None:
             await self.channel_layer.group_discard(self.room_group, self.channel_name)
 
+    # Receive frame from WebSocket.  Unlike the base class, accept binary frames too:
+    # orjson parses the bytes directly.
+    async def receive(
+        self,
+        text_data: str | None = None,
+        bytes_data: bytes | None = None,
+        **kwargs: Any,
+    ) -> None:
+        data = text_data or bytes_data
+        if not data:
+            msg = "No content in incoming WebSocket frame!"
+            raise ValueError(msg)
+
+        await self.receive_json(await self.decode_json(data), **kwargs)
+
     # Receive message from WebSocket
     async def receive_json(
         self,
@@ -59,36 +78,42 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):  # type: ignore[misc]
 
         await self.save_message(username, message)
 
-        # Send message to room group
+        # Send message to room group.  Encode it just once here, rather than once for
+        # every member of the group.
+        text = await self.encode_json({"message": message, "username": username})
         assert self.room_group is not None
         await self.channel_layer.group_send(
-            self.room_group,
-            {"type": "chat.message", "message": message, "username": username},
+            self.room_group, {"type": "chat.message", "text": text}
         )
 
     # Receive message from room group
-    async def chat_message(self, event: UserMessage) -> None:
-        message = event["message"]
-        username = event["username"]
-
+    async def chat_message(self, event: ChatEvent) -> None:
         # Send message to WebSocket
-        await self.send_json(content={"message": message, "username": username})
+        await self.send(text_data=event["text"])
+
+    @classmethod
+    async def decode_json(cls, text_data: str | bytes) -> Any:
+        return orjson.loads(text_data)
 
-    @sync_to_async
-    def save_message(self, username: str, message: str) -> None:
+    @classmethod
+    async def encode_json(cls, content: Any) -> str:
+        return orjson.dumps(content).decode()
+
+    async def save_message(self, username: str, message: str) -> None:
         chat_message = ChatMessage(
             team=self.team,
             level=self.level,
             name=username,
             content=message,
         )
-        chat_message.full_clean()
-        chat_message.save()
+        # The team and level were loaded from the database on connection.
+        # Validating them again would mean more database queries.
+        chat_message.full_clean(exclude=["team", "level"])
+        await chat_message.asave()
 
 
-@sync_to_async
-def async_get_level(number: int) -> Level:
-    return Level.objects.get(number=number)
+async def async_get_level(number: int) -> Level:
+    return await Level.objects.aget(number=number)
 
 
 @sync_to_async
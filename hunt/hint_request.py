@@ -5,6 +5,8 @@ from __future__ import annotations
 from datetime import timedelta
 from typing import TYPE_CHECKING
 
+from django.db import transaction
+from django.db.models import Max, Min, Q
 from django.utils import timezone
 
 from hunt.constants import HINTS_PER_LEVEL
@@ -45,17 +47,28 @@ def request_hint(request: AuthenticatedHttpRequest) -> str:
     if hunt_info.hint_requested:
         return "/level/" + lvl
 
-    # Log an event to say there's been a hint request.
-    event = HuntEvent()
-    event.time = timezone.now()
-    event.kind = HuntEvent.HINT_REQ
-    event.user = request.user
-    event.level = hunt_info.level
-    event.save()
-
-    # Record that a hint has been requested.
-    hunt_info.hint_requested = True
-    hunt_info.save()
+    with transaction.atomic():
+        # Record that a hint has been requested.  The update only matches if the
+        # team is still where we think it is and no request is in progress, so
+        # concurrent requests cannot both succeed.
+        requested = HuntInfo.objects.filter(
+            pk=hunt_info.pk,
+            level=hunt_info.level,
+            hints_shown=hunt_info.hints_shown,
+            hint_requested=False,
+        ).update(hint_requested=True)
+
+        # Another request got there first.
+        if not requested:
+            return "/level/" + lvl
+
+        # Log an event to say there's been a hint request.
+        event = HuntEvent()
+        event.time = timezone.now()
+        event.kind = HuntEvent.HINT_REQ
+        event.user = request.user
+        event.level = hunt_info.level
+        event.save()
 
     # Redirect back to the level in question.
     return "/level/" + lvl
@@ -64,12 +77,28 @@ def request_hint(request: AuthenticatedHttpRequest) -> str:
 def determine_hint_delay(hunt_info: HuntInfo) -> timedelta:
     """Determine how long a user has to wait before seeing the next hint."""
 
-    # Figure out where everyone stands.
-    hunts = HuntInfo.objects.filter(user__is_staff=False).order_by(
-        "-level", "-hints_shown"
+    # Figure out where the leaders and the last-placed teams stand, and how far
+    # through the user's own level the other teams there have got.
+    places = HuntInfo.objects.filter(user__is_staff=False).aggregate(
+        max_level=Max("level"),
+        min_level=Min("level"),
+        max_hints=Max("hints_shown"),
+        min_hints=Min("hints_shown"),
+        max_level_hints=Max("hints_shown", filter=Q(level=hunt_info.level)),
+        min_level_hints=Min("hints_shown", filter=Q(level=hunt_info.level)),
+    )
+    everyone_together = (
+        places["max_level"] == places["min_level"]
+        and places["max_hints"] == places["min_hints"]
+    )
+    in_first_place = (
+        hunt_info.level == places["max_level"]
+        and hunt_info.hints_shown == places["max_level_hints"]
+    )
+    in_last_place = (
+        hunt_info.level == places["min_level"]
+        and hunt_info.hints_shown == places["min_level_hints"]
     )
-    places = [(h.level, h.hints_shown) for h in hunts]
-    user_place = (hunt_info.level, hunt_info.hints_shown)
 
     # Default to a 30 minute delay and tweak according to the user's place.
     #
@@ -79,59 +108,75 @@ def determine_hint_delay(hunt_info: HuntInfo) -> timedelta:
     #
     # Last place gets a ten minute reduction.
     delay = 30
-    if places[0] == places[-1]:
+    if everyone_together:
         pass
 
-    elif user_place == places[0]:
+    elif in_first_place:
         delay += 10
 
-    elif user_place == places[-1]:
+    elif in_last_place:
         delay -= 10
 
     return timedelta(minutes=delay)
 
 
-def prepare_next_hint(hunt_info: HuntInfo) -> None:
-    """Prepare to release the next hint, by calculating when it becomes available."""
-    # Don't try to release more hints than there are.
-    if hunt_info.hints_shown >= HINTS_PER_LEVEL:
-        return
+def hint_is_due(hunt_info: HuntInfo) -> bool:
+    """Whether a requested hint has become available."""
+    if not hunt_info.hint_requested:
+        return False
 
-    # Don't try to release hints on the last level.
-    if hunt_info.level >= max_level():
-        return
+    if hunt_info.next_hint_release is None:
+        return False
 
-    # Calculate when to release the next hint.
-    now = timezone.now()
-    delay = determine_hint_delay(hunt_info)
-    hunt_info.next_hint_release = now + delay
-    hunt_info.save()
+    return timezone.now() >= hunt_info.next_hint_release
 
 
-def maybe_release_hint(user: User) -> None:
-    """Release any requested hint that has become available."""
-    hunt_info = user.huntinfo
+def next_hint_needed(hunt_info: HuntInfo) -> bool:
+    """Whether the release of the next hint still needs scheduling."""
+    if hunt_info.next_hint_release is not None:
+        return False
 
-    if not hunt_info.hint_requested:
-        return
+    # Don't try to release more hints than there are.
+    if hunt_info.hints_shown >= HINTS_PER_LEVEL:
+        return False
 
-    if hunt_info.next_hint_release is None:
-        return
+    # Don't try to release hints on the last level.
+    return hunt_info.level < max_level()
 
-    now = timezone.now()
-    if now < hunt_info.next_hint_release:
+
+def update_hints(user: User) -> None:
+    """Release any requested hint that is due, and schedule the next one."""
+    # Most page loads have nothing to do.
+    hunt_info = user.huntinfo
+    if not (hint_is_due(hunt_info) or next_hint_needed(hunt_info)):
         return
 
-    # Record the event.
-    event = HuntEvent()
-    event.time = now
-    event.user = user
-    event.kind = HuntEvent.HINT_REL
-    event.level = hunt_info.level
-    event.save()
-
-    # Release this hint.
-    hunt_info.hints_shown += 1
-    hunt_info.hint_requested = False
-    hunt_info.next_hint_release = None
-    hunt_info.save()
+    # Lock the team's progress, so that concurrent page loads can't both release the
+    # same hint.
+    with transaction.atomic():
+        hunt_info = HuntInfo.objects.select_for_update().get(pk=hunt_info.pk)
+        user.huntinfo = hunt_info
+
+        now = timezone.now()
+        if hint_is_due(hunt_info):
+            # Record the event.
+            event = HuntEvent()
+            event.time = now
+            event.user = user
+            event.kind = HuntEvent.HINT_REL
+            event.level = hunt_info.level
+            event.save()
+
+            # Release this hint.
+            hunt_info.hints_shown += 1
+            hunt_info.hint_requested = False
+            hunt_info.next_hint_release = None
+
+        # Calculate when to release the next hint.
+        if next_hint_needed(hunt_info):
+            delay = determine_hint_delay(hunt_info)
+            hunt_info.next_hint_release = now + delay
+
+        hunt_info.save(
+            update_fields=["hints_shown", "hint_requested", "next_hint_release"]
+        )
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import math
 from typing import TYPE_CHECKING
 
+from django.db import transaction
+from django.db.models import FloatField
+from django.db.models.functions import Cast
 from django.template import loader
 from django.utils import timezone
-from geopy import Point, distance
 
 from hunt.constants import HINTS_PER_LEVEL
-from hunt.models import ChatMessage, HuntEvent, Level
+from hunt.models import ChatMessage, Hint, HuntEvent, Level
 from hunt.utils import max_level
 
 if TYPE_CHECKING:
@@ -15,25 +18,52 @@ if TYPE_CHECKING:
 
     from hunt.utils import AuthenticatedHttpRequest
 
+# Mean radius of the earth, in metres.
+EARTH_RADIUS = 6_371_009
+
 
 def advance_level(user: User) -> None:
     hunt_info = user.huntinfo
     new_level = hunt_info.level + 1
 
-    # Log an event to record this.
-    event = HuntEvent()
-    event.time = timezone.now()
-    event.kind = HuntEvent.CLUE_ADV
-    event.user = user
-    event.level = new_level
-    event.save()
-
-    # Update the team's level, clear any hint request flags and save.
-    hunt_info.level = new_level
-    hunt_info.hints_shown = 1
-    hunt_info.hint_requested = False
-    hunt_info.next_hint_release = None
-    hunt_info.save()
+    with transaction.atomic():
+        # Log an event to record this.
+        event = HuntEvent()
+        event.time = timezone.now()
+        event.kind = HuntEvent.CLUE_ADV
+        event.user = user
+        event.level = new_level
+        event.save()
+
+        # Update the team's level, clear any hint request flags and save.
+        hunt_info.level = new_level
+        hunt_info.hints_shown = 1
+        hunt_info.hint_requested = False
+        hunt_info.next_hint_release = None
+        hunt_info.save(
+            update_fields=[
+                "level",
+                "hints_shown",
+                "hint_requested",
+                "next_hint_release",
+            ]
+        )
+
+
+def distance(
+    latitude1: float, longitude1: float, latitude2: float, longitude2: float
+) -> float:
+    """Great-circle distance in metres, by the haversine formula."""
+    phi1 = math.radians(latitude1)
+    phi2 = math.radians(latitude2)
+    delta_phi = phi2 - phi1
+    delta_lambda = math.radians(longitude2 - longitude1)
+
+    a = (
+        math.sin(delta_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
 
 
 def look_for_level(request: AuthenticatedHttpRequest) -> str:
@@ -56,17 +86,29 @@ def look_for_level(request: AuthenticatedHttpRequest) -> str:
 
     # Make sure we're searching in a valid place.
     try:
-        search_point = Point(latitude, longitude)
+        search_latitude = float(latitude)
+        search_longitude = float(longitude)
     except ValueError:
         return "/oops"
 
-    # Get the distance between the search location and the level solution.
-    level = Level.objects.get(number=search_level)
-    level_point = Point(level.latitude, level.longitude)
-    dist = distance.distance(search_point, level_point).m
+    if not (-90 <= search_latitude <= 90 and math.isfinite(search_longitude)):
+        return "/oops"
+
+    # Get the distance between the search location and the level solution.  Have the
+    # database convert the solution to floats, rather than building Decimals.
+    level_latitude, level_longitude, tolerance = (
+        Level.objects.filter(number=search_level)
+        .values_list(
+            Cast("latitude", FloatField()),
+            Cast("longitude", FloatField()),
+            "tolerance",
+        )
+        .get()
+    )
+    dist = distance(search_latitude, search_longitude, level_latitude, level_longitude)
 
     # If the distance is small enough, accept the solution.
-    if dist <= level.tolerance:
+    if dist <= tolerance:
         if search_level == team_level:
             advance_level(user)
 
@@ -88,15 +130,22 @@ def maybe_load_level(request: AuthenticatedHttpRequest, level_num: int) -> str:
 
     # Only load the level if it's one the team has access to.
     if 0 < level_num <= team_level:
-        # Get this level and the one before.
-        current_level = Level.objects.get(number=level_num)
-        previous_level = Level.objects.get(number=level_num - 1)
+        # Get the level before, which holds the description and the solution.  The
+        # level itself is needed only for its hints and chat, which are looked up by
+        # number.
+        previous_level = Level.objects.only(
+            "name", "description", "latitude", "longitude"
+        ).get(number=level_num - 1)
 
         # Decide how many images to display.  Show all hints for solved levels.
         num_hints = HINTS_PER_LEVEL if level_num < team_level else team.hints_shown
 
         # Get the URLs for the images to show.
-        hints = current_level.hints.filter(number__lt=num_hints).order_by("number")
+        hints = (
+            Hint.objects.filter(level=level_num, number__lt=num_hints)
+            .only("image")
+            .order_by("number")
+        )
         hint_urls = [hint.image.url for hint in hints]
 
         # Don't allow a hint if one has already been requested by the team, or if max
@@ -111,13 +160,20 @@ def maybe_load_level(request: AuthenticatedHttpRequest, level_num: int) -> str:
             allow_hint = True
             reason = ""
 
-        is_last_level = current_level.number == max_level_num
+        is_last_level = level_num == max_level_num
         desc_paras = previous_level.description.splitlines()
 
+        # The chat history needs only the names and the content.
+        messages = list(
+            ChatMessage.objects.filter(team=user, level=level_num).values(
+                "name", "content"
+            )
+        )
+
         template = loader.get_template("level.html")
         context = {
             "team_level": team_level,
-            "level_number": current_level.number,
+            "level_number": level_num,
             "level_name": previous_level.name.upper(),
             "hints": hint_urls,
             "desc_paras": desc_paras,
@@ -126,7 +182,7 @@ def maybe_load_level(request: AuthenticatedHttpRequest, level_num: int) -> str:
             "latitude": previous_level.latitude,
             "longitude": previous_level.longitude,
             "is_last": is_last_level,
-            "messages": ChatMessage.objects.filter(team=user, level=current_level),
+            "messages": messages,
         }
     else:
         # Shouldn't be here. Show an error page.
@@ -147,11 +203,13 @@ def list_levels(request: AuthenticatedHttpRequest) -> str:
             return name[:20] + "..."
         return name
 
-    done_levels = Level.objects.filter(number__gt=0, number__lt=team_level).order_by(
-        "number"
+    done_levels = (
+        Level.objects.filter(number__gt=0, number__lt=team_level)
+        .order_by("number")
+        .values_list("number", "name")
     )
     levels = [
-        {"number": level.number, "name": truncate(level.name)} for level in done_levels
+        {"number": number, "name": truncate(name)} for number, name in done_levels
     ]
     levels.append({"number": team_level, "name": "Latest level"})
 
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-import contextlib
 import datetime
 import zoneinfo
-from functools import wraps
-from typing import TYPE_CHECKING, Concatenate
+from functools import cache, wraps
+from typing import TYPE_CHECKING, Any, Concatenate
 
 import holidays
+from django.db import transaction
 from django.db.models import Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.http.response import HttpResponse
 from django.template import loader
 
@@ -27,11 +29,47 @@ if TYPE_CHECKING:
     ]
 
 
+# Levels change rarely, so remember the last level until one is saved or deleted.
+#
+# Clear the cache once the change is committed too: a page load racing with an
+# uncommitted edit would otherwise cache the old value.
+@cache
 def max_level() -> int:
     max_level: int = Level.objects.all().aggregate(Max("number"))["number__max"]
     return max_level
 
 
+@receiver([post_save, post_delete], sender=Level)
+def level_changed(
+    sender: type[Level],  # noqa: ARG001
+    **kwargs: Any,  # noqa: ARG001
+) -> None:
+    max_level.cache_clear()
+    transaction.on_commit(max_level.cache_clear)
+
+
+# The active settings are read on every page, but change only when an admin edits
+# them.  As with max_level(), clear the cache again once the change is committed.
+@cache
+def active_setting() -> AppSetting | None:
+    return AppSetting.objects.filter(active=True).first()
+
+
+@receiver([post_save, post_delete], sender=AppSetting)
+def app_setting_changed(
+    sender: type[AppSetting],  # noqa: ARG001
+    **kwargs: Any,  # noqa: ARG001
+) -> None:
+    active_setting.cache_clear()
+    transaction.on_commit(active_setting.cache_clear)
+
+
+# Building the holiday calendar is relatively expensive, so keep it for each year.
+@cache
+def uk_holidays(year: int) -> holidays.HolidayBase:
+    return holidays.country_holidays("UK", years=year)
+
+
 # Should players be locked out?  True before the hunt starts, and during UK working
 # hours.
 def players_are_locked_out() -> bool:
@@ -39,10 +77,8 @@ def players_are_locked_out() -> bool:
     now = datetime.datetime.now(tz=london)
 
     # Prevent access before the start time, if configured.
-    start = None
-    with contextlib.suppress(AppSetting.DoesNotExist):
-        settings = AppSetting.objects.get(active=True)
-        start = settings.start_time
+    settings = active_setting()
+    start = None if settings is None else settings.start_time
 
     if start is not None and now < start:
         return True
@@ -52,7 +88,7 @@ def players_are_locked_out() -> bool:
         return False
 
     # Allow access on bank holidays.
-    if now.date() in holidays.country_holidays("UK"):
+    if now.date() in uk_holidays(now.year):
         return False
 
     # Prevent access 9:00 - 12:30, and 13:30 - 17:30.
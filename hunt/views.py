@@ -1,27 +1,34 @@
 from __future__ import annotations
 
-import contextlib
 import csv
+import io
 import os
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.http.response import HttpResponse
+from django.http.response import HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.template import loader
 
-from hunt.hint_request import maybe_release_hint, prepare_next_hint, request_hint
+from hunt.hint_request import request_hint, update_hints
 from hunt.level_mgr import upload_new_level
 from hunt.levels import list_levels, look_for_level, maybe_load_level
-from hunt.models import AppSetting, HuntEvent
-from hunt.utils import max_level, no_players_during_lockout
+from hunt.models import HuntEvent
+from hunt.utils import active_setting, max_level, no_players_during_lockout
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
+
     from django.http.request import HttpRequest
 
     from hunt.utils import AuthenticatedHttpRequest
 
 
+# Map API keys, from the environment.
+GM_API_KEY = os.environ.get("GM_API_KEY")
+ARCGIS_API_KEY = os.environ.get("ARCGIS_API_KEY")
+
+
 # Send users to the hunt and admins to management.
 @login_required
 @no_players_during_lockout
@@ -32,21 +39,43 @@ def go_home(request: AuthenticatedHttpRequest) -> HttpResponse:
     return redirect("/home")
 
 
+# Hunt event log export.  The fields are fixed, so work out the columns just once.
+# Teams are written by name, so read that alongside each event rather than loading
+# every user separately.
+HUNT_EVENT_META = HuntEvent._meta  # noqa: SLF001
+HUNT_EVENT_FIELDS = [field.name for field in HUNT_EVENT_META.fields]
+HUNT_EVENT_COLUMNS = [
+    "user__username" if name == "user" else name for name in HUNT_EVENT_FIELDS
+]
+EXPORT_BATCH_SIZE = 2000
+
+
+# Write rows of the event log export as CSV text.
+def hunt_events_csv(rows: Iterable[Iterable[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
 # Admin-only page to download hunt event logs.
 @user_passes_test(lambda u: u.is_staff)
-def get_hunt_events(_request: HttpRequest) -> HttpResponse:
-    meta = HuntEvent._meta  # noqa: SLF001
-    field_names = [field.name for field in meta.fields]
+def get_hunt_events(_request: HttpRequest) -> StreamingHttpResponse:
+    queryset = HuntEvent.objects.values(*HUNT_EVENT_COLUMNS)
 
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f"attachment; filename={meta}.csv"
-    writer = csv.writer(response)
+    # Stream the file as the rows are read, rather than building it all first.  Send
+    # a batch of rows at a time, rather than each row as a separate message.
+    async def content() -> AsyncIterator[str]:
+        batch: list[Iterable[Any]] = [HUNT_EVENT_FIELDS]
+        async for row in queryset.aiterator(chunk_size=EXPORT_BATCH_SIZE):
+            batch.append(row.values())
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                yield hunt_events_csv(batch)
+                batch.clear()
 
-    writer.writerow(field_names)
+        yield hunt_events_csv(batch)
 
-    queryset = HuntEvent.objects.all()
-    for obj in queryset:
-        writer.writerow(getattr(obj, field) for field in field_names)
+    response = StreamingHttpResponse(content(), content_type="text/csv")
+    response["Content-Disposition"] = f"attachment; filename={HUNT_EVENT_META}.csv"
 
     return response
 
@@ -69,14 +98,8 @@ def home(request: AuthenticatedHttpRequest) -> HttpResponse:
 @login_required
 @no_players_during_lockout
 def level(request: AuthenticatedHttpRequest, level: int) -> HttpResponse:
-    # Release a hint, if appropriate.
-    user = request.user
-    maybe_release_hint(user)
-
-    # Prepare the next hint, if appropriate.
-    hunt_info = user.huntinfo
-    if hunt_info.next_hint_release is None:
-        prepare_next_hint(hunt_info)
+    # Release a hint, and prepare the next one, if appropriate.
+    update_hints(request.user)
 
     # Show the level.
     return HttpResponse(maybe_load_level(request, level))
@@ -99,22 +122,18 @@ def oops(request: AuthenticatedHttpRequest) -> HttpResponse:
 @no_players_during_lockout
 def default_map(request: AuthenticatedHttpRequest) -> HttpResponse:
     # If we're configured to use the alt map, do so.
-    settings = None
-    with contextlib.suppress(AppSetting.DoesNotExist):
-        settings = AppSetting.objects.get(active=True)
-
+    settings = active_setting()
     use_alternative_map = False if settings is None else settings.use_alternative_map
     if use_alternative_map:
         return alt_map(request)
 
     # If we don't have a Google Maps API key, use the alt map.
-    gm_api_key = os.environ.get("GM_API_KEY")
-    if gm_api_key is None:
+    if GM_API_KEY is None:
         return alt_map(request)
 
     # Use the Google map.
     template = loader.get_template("google-map.html")
-    context = {"api_key": gm_api_key, "lvl": request.GET.get("lvl")}
+    context = {"api_key": GM_API_KEY, "lvl": request.GET.get("lvl")}
 
     return HttpResponse(template.render(context, request))
 
@@ -124,8 +143,7 @@ def default_map(request: AuthenticatedHttpRequest) -> HttpResponse:
 @no_players_during_lockout
 def alt_map(request: AuthenticatedHttpRequest) -> HttpResponse:
     template = loader.get_template("alternate-map.html")
-    arcgis_api_key = os.environ.get("ARCGIS_API_KEY")
-    context = {"api_key": arcgis_api_key, "lvl": request.GET.get("lvl")}
+    context = {"api_key": ARCGIS_API_KEY, "lvl": request.GET.get("lvl")}
     return HttpResponse(template.render(context, request))
 
 
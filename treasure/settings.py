@@ -144,6 +144,11 @@ LOGGING = {
     },
 }
 
+AUTHENTICATION_BACKENDS = [
+    "hunt.backends.HuntInfoBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 PASSWORD_VALIDATION = "django.contrib.auth.password_validation"  # noqa: S105